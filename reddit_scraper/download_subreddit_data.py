@@ -1,18 +1,64 @@
 #!/usr/bin/env python3
 import argparse
 import datetime
-import json
+import hashlib
 import os
+import random
 import sys
 import time
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
 from typing import Dict, List, Optional, Tuple
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 # Constants
 API_URL = "https://arctic-shift.photon-reddit.com"
+REQUEST_TIMEOUT = (3.05, 30)
+WRITE_BUFFER_SIZE = 1 << 20
+CACHE_DIR = os.path.expanduser("~/.cache/reddit_scraper")
+CACHE_TTL = 24 * 60 * 60
+MAX_RETRIES = 10
+MAX_BACKOFF = 60
+PROGRESS_INTERVAL = 0.2
+RATE_SMOOTHING = 0.1
+
+
+def build_session() -> requests.Session:
+    """Build a requests session whose connections are reused across requests"""
+    session = requests.Session()
+    # Return the last response once retries run out so Retry-After stays visible
+    retries = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # requests already advertises gzip, and br when the brotli package is installed
+    session.headers.update(
+        {"User-Agent": "download-tool-cli", "Accept": "application/json"}
+    )
+    return session
+
+
+def retry_delay(error: Exception, attempt: int) -> float:
+    """Get the time to wait before retrying after an error"""
+    # Honor the delay requested by the server when rate limited
+    response = getattr(error, "response", None)
+    if response is not None and response.status_code == 429:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(MAX_BACKOFF, 2**attempt))
 
 
 class DownloadType(Enum):
@@ -20,31 +66,51 @@ class DownloadType(Enum):
     USER = "author"
 
 
-@dataclass
 class DownloadStats:
-    total_items: int = 0
-    start_time: float = 0
-    running_time: float = 0
-    current_date: Optional[datetime.datetime] = None
-    repeated_error_count: int = 0
-    is_paused: bool = False
-    is_done: bool = False
-    has_error: bool = False
+    __slots__ = (
+        "total_items",
+        "start_time",
+        "running_time",
+        "current_date_ms",
+        "items_per_second",
+        "repeated_error_count",
+        "is_paused",
+        "is_done",
+        "has_error",
+    )
+
+    def __init__(self):
+        self.total_items = 0
+        self.start_time = 0.0
+        self.running_time = 0.0
+        self.current_date_ms: Optional[int] = None
+        self.items_per_second = 0.0
+        self.repeated_error_count = 0
+        self.is_paused = False
+        self.is_done = False
+        self.has_error = False
+
+    def update_rate(self, batch_items: int, batch_time: float) -> None:
+        """Update the moving average of the download rate with a new batch"""
+        if batch_time <= 0:
+            return
+        rate = batch_items / batch_time
+        # The first batch seeds the average
+        smoothing = RATE_SMOOTHING if self.items_per_second else 1.0
+        self.items_per_second += smoothing * (rate - self.items_per_second)
 
     def format_progress(self) -> str:
         if not self.start_time:
             return "Not started"
 
-        elapsed = time.time() - self.start_time
         if self.total_items == 0:
             return "No items downloaded yet"
 
-        items_per_second = self.total_items / max(1, elapsed)
-
         progress = f"Downloaded {self.total_items} items"
-        if self.current_date:
-            progress += f" up to {self.current_date.strftime('%Y-%m-%d %H:%M:%S')}"
-        progress += f" ({items_per_second:.2f} items/s)"
+        if self.current_date_ms:
+            current_date = datetime.datetime.fromtimestamp(self.current_date_ms / 1000)
+            progress += f" up to {current_date.strftime('%Y-%m-%d %H:%M:%S')}"
+        progress += f" ({self.items_per_second:.2f} items/s)"
 
         if self.is_paused:
             progress += " [PAUSED]"
@@ -57,6 +123,22 @@ class DownloadStats:
 
 
 class ArchiveStream:
+    __slots__ = (
+        "url",
+        "start_date",
+        "current_date",
+        "output_file",
+        "item_type",
+        "append",
+        "stats",
+        "session",
+        "_last_url",
+        "_last_etag",
+        "_last_data",
+        "_last_print_ts",
+        "_last_batch_ts",
+    )
+
     def __init__(
         self,
         url: str,
@@ -64,6 +146,7 @@ class ArchiveStream:
         output_file: str,
         item_type: str,
         append: bool = False,
+        session: Optional[requests.Session] = None,
     ):
         self.url = url
         self.start_date = start_date
@@ -72,85 +155,128 @@ class ArchiveStream:
         self.item_type = item_type
         self.append = append
         self.stats = DownloadStats()
+        self.session = session or build_session()
+        self._last_url: Optional[str] = None
+        self._last_etag: Optional[str] = None
+        self._last_data: List[Dict] = []
+        self._last_print_ts = 0.0
+        self._last_batch_ts = 0.0
 
     def start(self) -> None:
         """Start the download process"""
-        mode = "a" if self.append else "w"
-        self.stats.start_time = time.time()
+        mode = "ab" if self.append else "wb"
+        self.stats.start_time = time.monotonic()
         self.stats.is_paused = False
+        self._last_batch_ts = self.stats.start_time
 
+        # A single worker prefetches the next page while the current one is written
+        executor = ThreadPoolExecutor(max_workers=1)
         try:
-            with open(self.output_file, mode) as f:
-                self._run(f)
+            with open(self.output_file, mode, buffering=WRITE_BUFFER_SIZE) as f:
+                self._run(f, executor)
         except KeyboardInterrupt:
             print(f"\n{self.item_type} download interrupted.")
             self.stats.is_paused = True
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
-    def _run(self, file_handle) -> None:
+    def _run(self, file_handle, executor: ThreadPoolExecutor) -> None:
         """Run the download loop"""
+        prefetch: Optional[Future] = None
         while not self.stats.is_paused and not self.stats.is_done:
             try:
-                data = self._fetch_data()
+                if prefetch is not None:
+                    data = prefetch.result()
+                else:
+                    data = self._fetch_data(self.current_date)
+                prefetch = None
+
                 if not data or len(data) == 0:
+                    self._print_progress(force=True)
                     print(f"\n{self.item_type} download complete!")
                     self.stats.is_done = True
                     break
 
                 # Update stats
+                now = time.monotonic()
+                self.stats.update_rate(len(data), now - self._last_batch_ts)
+                self._last_batch_ts = now
                 self.stats.total_items += len(data)
                 last_item = data[-1]
                 new_date = last_item.get("created_utc", 0) * 1000
                 if new_date == self.current_date:
                     new_date += 1000
                 self.current_date = new_date
-                self.stats.current_date = datetime.datetime.fromtimestamp(
-                    new_date / 1000
-                )
+                self.stats.current_date_ms = new_date
 
-                # Write data to file
-                for item in data:
-                    file_handle.write(json.dumps(item) + "\n")
-                file_handle.flush()
+                # Start fetching the next page before writing this one
+                prefetch = executor.submit(self._fetch_data, new_date)
+
+                # Write the whole page at once, the buffer is flushed on close
+                file_handle.write(b"".join(orjson.dumps(item) + b"\n" for item in data))
 
                 # Reset error count and clear error flag
                 self.stats.repeated_error_count = 0
                 if self.stats.has_error:
                     self.stats.has_error = False
 
-                # Print progress
-                print(f"\r{self.stats.format_progress()}", end="", flush=True)
+                self._print_progress()
 
             except Exception as e:
+                # Drop any pending page and retry synchronously from the current date
+                prefetch = None
                 print(f"\nError: {str(e)}")
                 self.stats.has_error = True
                 self.stats.repeated_error_count += 1
 
-                # Implement exponential backoff
-                if 0.5 * (self.stats.repeated_error_count**2) > 60:
+                if self.stats.repeated_error_count > MAX_RETRIES:
                     print(
                         f"\nToo many repeated errors. {self.item_type} download aborted."
                     )
                     self.stats.is_done = True
                     break
                 else:
-                    sleep_time = self.stats.repeated_error_count
-                    print(f"Retrying in {sleep_time} seconds...")
+                    sleep_time = retry_delay(e, self.stats.repeated_error_count)
+                    print(f"Retrying in {sleep_time:.1f} seconds...")
                     time.sleep(sleep_time)
 
-    def _fetch_data(self) -> List[Dict]:
-        """Fetch data from the API"""
-        url = f"{self.url}&limit=auto&sort=asc&after={self.current_date}&meta-app=download-tool-cli"
-        response = requests.get(url)
+    def _print_progress(self, force: bool = False) -> None:
+        """Print the progress line, at most once per PROGRESS_INTERVAL"""
+        now = time.monotonic()
+        if not force and now - self._last_print_ts < PROGRESS_INTERVAL:
+            return
+        self._last_print_ts = now
+        sys.stdout.write(f"\r{self.stats.format_progress()}")
+        sys.stdout.flush()
+
+    def _fetch_data(self, after: int) -> List[Dict]:
+        """Fetch the page of data created after the given timestamp"""
+        url = f"{self.url}&limit=auto&sort=asc&after={after}&meta-app=download-tool-cli"
+
+        # Revalidate instead of downloading the same page body again
+        headers = {}
+        if self._last_etag and url == self._last_url:
+            headers["If-None-Match"] = self._last_etag
+
+        response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304:
+            # Unchanged since the last fetch of this URL, not the end of the stream
+            return self._last_data
         if response.status_code != 200:
-            raise Exception(
-                f"API returned status code {response.status_code}: {response.text}"
+            raise requests.HTTPError(
+                f"API returned status code {response.status_code}: {response.text}",
+                response=response,
             )
 
-        data = response.json()
+        # Decode the UTF-8 body directly, skipping the intermediate str
+        data = orjson.loads(response.content)
         if data.get("error"):
             raise Exception(f"API returned error: {data['error']}")
 
-        return data.get("data", [])
+        self._last_url = url
+        self._last_etag = response.headers.get("ETag")
+        self._last_data = data.get("data", [])
+        return self._last_data
 
 
 class CombinedArchiveStream:
@@ -175,14 +301,51 @@ class CombinedArchiveStream:
         print("\nAll downloads complete!")
 
 
-def validate_name(name: str, download_type: DownloadType) -> Tuple[bool, dict]:
+def _cache_path(key: str) -> str:
+    """Get the cache file of a key, hashed so user input cannot escape CACHE_DIR"""
+    return os.path.join(CACHE_DIR, f"{hashlib.sha256(key.encode()).hexdigest()}.json")
+
+
+def _read_cache(key: str) -> Optional[list]:
+    """Return a cached value if it exists and has not expired"""
+    path = _cache_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL:
+            return None
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def _write_cache(key: str, value: list) -> None:
+    """Store a value in the cache, ignoring any filesystem errors"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(key), "wb") as f:
+            f.write(orjson.dumps(value))
+    except OSError:
+        pass
+
+
+def validate_name(
+    name: str, download_type: DownloadType, session: requests.Session
+) -> Tuple[bool, dict]:
     """Validate that the subreddit or user exists and get its info"""
     if len(name) < 2:
         raise ValueError("Name must be at least 2 characters long")
 
+    # Reuse the answer of a previous run from the last 24 hours
+    cache_key = f"{download_type.value}_{name}"
+    cached = _read_cache(cache_key)
+    if cached is not None:
+        date_timestamp, info = cached
+        return date_timestamp, info
+
     # Get the earliest date
-    response = requests.get(
-        f"{API_URL}/api/utils/min?{download_type.value}={name}&meta-app=download-tool-cli"
+    response = session.get(
+        f"{API_URL}/api/utils/min?{download_type.value}={name}&meta-app=download-tool-cli",
+        timeout=REQUEST_TIMEOUT,
     )
     if response.status_code != 200:
         raise Exception(f"API returned status code {response.status_code}")
@@ -201,7 +364,7 @@ def validate_name(name: str, download_type: DownloadType) -> Tuple[bool, dict]:
             f"{API_URL}/api/users/search?author={name}&meta-app=download-tool-cli"
         )
 
-    info_response = requests.get(info_url)
+    info_response = session.get(info_url, timeout=REQUEST_TIMEOUT)
     if info_response.status_code != 200:
         raise Exception(f"API returned status code {info_response.status_code}")
 
@@ -214,6 +377,7 @@ def validate_name(name: str, download_type: DownloadType) -> Tuple[bool, dict]:
         * 1000
     )
 
+    _write_cache(cache_key, [date_timestamp, info])
     return date_timestamp, info
 
 
@@ -277,9 +441,12 @@ def main():
         DownloadType.SUBREDDIT if args.type == "subreddit" else DownloadType.USER
     )
 
+    # One connection pool shared by the validation and both streams
+    session = build_session()
+
     try:
         # Validate the name and get info
-        start_timestamp, info = validate_name(args.name, download_type)
+        start_timestamp, info = validate_name(args.name, download_type, session)
 
         # Display info
         if download_type == DownloadType.SUBREDDIT:
@@ -341,7 +508,7 @@ def main():
             posts_file = os.path.join(args.output_dir, f"{file_prefix}_posts.jsonl")
             posts_url = f"{API_URL}/api/posts/search?{download_type.value}={args.name}{end_date_condition}"
             posts_stream = ArchiveStream(
-                posts_url, start_timestamp, posts_file, "Posts", args.append
+                posts_url, start_timestamp, posts_file, "Posts", args.append, session
             )
 
         if args.comments:
@@ -350,7 +517,12 @@ def main():
             )
             comments_url = f"{API_URL}/api/comments/search?{download_type.value}={args.name}{end_date_condition}"
             comments_stream = ArchiveStream(
-                comments_url, start_timestamp, comments_file, "Comments", args.append
+                comments_url,
+                start_timestamp,
+                comments_file,
+                "Comments",
+                args.append,
+                session,
             )
 
         # Start the downloads
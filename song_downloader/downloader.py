@@ -2,15 +2,35 @@
 Core downloader class for the Suno Downloader.
 """
 
-import time
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import requests
-from requests.adapters import HTTPAdapter
-from suno_downloader.utils import check_existing_file, extract_song_id
+from suno_downloader.utils import (
+    TokenBucket,
+    build_session,
+    check_existing_file,
+    extract_song_id,
+)
 from tqdm import tqdm
-from urllib3.util import Retry
+
+# Size of the buffer used to copy response bodies to disk
+DOWNLOAD_CHUNK = 1024 * 1024
+DOWNLOAD_TIMEOUT = (3.05, 60)
+
+
+class DownloadStatus(Enum):
+    """
+    Outcome of a single download, valued after the keys of the results dict.
+    """
+
+    SUCCESS = "success"
+    FAILED = "failed"
+    SKIPPED = "skipped"
 
 
 class SunoDownloader:
@@ -19,7 +39,12 @@ class SunoDownloader:
     """
 
     def __init__(
-        self, output_dir: Union[str, Path] = "downloads", skip_existing: bool = True
+        self,
+        output_dir: Union[str, Path] = "downloads",
+        skip_existing: bool = True,
+        requests_per_second: float = 2.0,
+        burst: int = 4,
+        session: Optional[requests.Session] = None,
     ):
         """
         Initialize the downloader with an output directory.
@@ -27,6 +52,9 @@ class SunoDownloader:
         Args:
             output_dir: Directory to save downloads
             skip_existing: If True, skip downloads that already exist
+            requests_per_second: Sustained rate of requests to the CDN
+            burst: Number of requests that may be issued back to back
+            session: Optional requests session to share with other downloaders
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
@@ -36,20 +64,52 @@ class SunoDownloader:
         self.output_dir_suno = self.output_dir / "suno"
         self.output_dir_suno.mkdir(exist_ok=True)
 
-        # Set up a requests session with retries
-        self.session = requests.Session()
-        retries = Retry(
-            total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504]
-        )
-        self.session.mount("http://", HTTPAdapter(max_retries=retries))
-        self.session.mount("https://", HTTPAdapter(max_retries=retries))
-        self.session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-        )
-
-    def download_song(self, url: str, filename_prefix: str = "") -> Optional[Path]:
+        # Rate limit shared by every download issued through this instance
+        self._bucket = TokenBucket(rate=requests_per_second, capacity=burst)
+
+        # Scan the output directory once so existing songs can be skipped early
+        self._existing = {entry.name for entry in os.scandir(self.output_dir_suno)}
+
+        # Set up a requests session with retries unless one is shared
+        self.session = session or build_session()
+
+    @staticmethod
+    def song_filename(song_id: str, filename_prefix: str = "") -> str:
+        """
+        Build the filename of a song based on its ID and an optional prefix.
+
+        Args:
+            song_id: Suno song ID
+            filename_prefix: Optional prefix for the filename
+
+        Returns:
+            Filename of the song
+        """
+        if filename_prefix:
+            return f"{filename_prefix}_{song_id}.mp3"
+        return f"{song_id}.mp3"
+
+    def is_downloaded(self, url: str, filename_prefix: str = "") -> bool:
+        """
+        Check whether the song of a URL was already downloaded and can be skipped.
+
+        Args:
+            url: Original Suno URL
+            filename_prefix: Optional prefix for the filename
+
+        Returns:
+            True if the song file exists and skip_existing is set
+        """
+        if not self.skip_existing:
+            return False
+        song_id = extract_song_id(url)
+        if not song_id:
+            return False
+        return self.song_filename(song_id, filename_prefix) in self._existing
+
+    def download_song(
+        self, url: str, filename_prefix: str = ""
+    ) -> Tuple[DownloadStatus, Optional[Path]]:
         """
         Download audio from Suno.ai using the simplified method.
 
@@ -58,7 +118,7 @@ class SunoDownloader:
             filename_prefix: Optional prefix for the filename
 
         Returns:
-            Path to the downloaded file or None if failed
+            Download status and the path to the song file, None if failed
         """
         try:
             # Extract the song ID from the URL
@@ -66,20 +126,15 @@ class SunoDownloader:
 
             if not song_id:
                 print(f"  Could not extract Suno song ID from URL: {url}")
-                return None
-
-            # Create a filename based on the song ID and prefix
-            if filename_prefix:
-                filename = f"{filename_prefix}_{song_id}.mp3"
-            else:
-                filename = f"{song_id}.mp3"
+                return DownloadStatus.FAILED, None
 
+            filename = self.song_filename(song_id, filename_prefix)
             filepath = self.output_dir_suno / filename
 
             # Check if file already exists
             existing = check_existing_file(filepath, self.skip_existing)
             if existing:
-                return existing
+                return DownloadStatus.SKIPPED, existing
 
             # Construct the direct CDN URL
             cdn_url = f"https://cdn1.suno.ai/{song_id}.mp3"
@@ -87,38 +142,42 @@ class SunoDownloader:
             print(f"  Using direct CDN URL: {cdn_url}")
 
             # Download the audio file
-            response = self.session.get(cdn_url, stream=True)
+            self._bucket.acquire()
+            response = self.session.get(cdn_url, stream=True, timeout=DOWNLOAD_TIMEOUT)
             if response.status_code == 200:
                 print(f"  Downloading audio to: {filepath}")
+                response.raw.decode_content = True
                 with open(filepath, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                return filepath
+                    shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK)
+                self._existing.add(filename)
+                return DownloadStatus.SUCCESS, filepath
             else:
                 print(f"  Failed to download audio: HTTP {response.status_code}")
                 print(f"  URL attempted: {cdn_url}")
-                return None
+                return DownloadStatus.FAILED, None
 
         except Exception as e:
             print(f"  Error downloading Suno audio {url}: {e}")
-            return None
+            return DownloadStatus.FAILED, None
 
     def download_from_url_list(
-        self, urls: List[str], sleep_time: float = 0.5
+        self, urls: List[str], max_workers: int = 8
     ) -> Dict[str, Any]:
         """
-        Download songs from a list of URLs.
+        Download songs from a list of URLs using a pool of worker threads.
 
         Args:
             urls: List of URLs to download
-            sleep_time: Time to sleep between requests
+            max_workers: Number of concurrent downloads
 
         Returns:
             Dictionary with download statistics
         """
         results = {"success": 0, "failed": 0, "skipped": 0, "urls": []}
 
-        for url in tqdm(urls, desc="Downloading songs"):
+        # Keyed by song ID so the same song is never written by two workers at once
+        suno_urls: Dict[str, str] = {}
+        for url in urls:
             if not url.strip():
                 print("Empty URL, skipping")
                 results["skipped"] += 1
@@ -129,26 +188,41 @@ class SunoDownloader:
                 results["skipped"] += 1
                 continue
 
+            if self.is_downloaded(url):
+                results["skipped"] += 1
+                results["urls"].append(
+                    {"url": url, "status": "skipped", "filepath": None}
+                )
+                continue
+
+            song_id = extract_song_id(url) or url
+            if song_id in suno_urls:
+                results["skipped"] += 1
+                results["urls"].append(
+                    {"url": url, "status": "skipped", "filepath": None}
+                )
+                continue
+
+            suno_urls[song_id] = url
+
+        def download(url: str) -> Tuple[DownloadStatus, Optional[Path]]:
             print(f"Processing URL: {url}")
-            filepath = self.download_song(url)
+            return self.download_song(url)
 
-            url_result = {"url": url, "status": "unknown", "filepath": None}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(download, url): url for url in suno_urls.values()}
 
-            if filepath:
-                if "skipping download" in str(filepath):
-                    url_result["status"] = "skipped"
-                    results["skipped"] += 1
-                else:
-                    url_result["status"] = "success"
-                    url_result["filepath"] = str(filepath)
-                    results["success"] += 1
-            else:
-                url_result["status"] = "failed"
-                results["failed"] += 1
+            for future in tqdm(
+                as_completed(futures), total=len(futures), desc="Downloading songs"
+            ):
+                url = futures[future]
+                status, filepath = future.result()
 
-            results["urls"].append(url_result)
+                url_result = {"url": url, "status": status.value, "filepath": None}
+                if status is DownloadStatus.SUCCESS:
+                    url_result["filepath"] = str(filepath)
+                results[status.value] += 1
 
-            # Sleep to avoid rate limiting
-            time.sleep(sleep_time)
+                results["urls"].append(url_result)
 
         return results
@@ -2,22 +2,46 @@
 Input parsing functions for the Suno Downloader.
 """
 
-import time
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
-import pandas as pd
-from suno_downloader.downloader import SunoDownloader
+import orjson
+from suno_downloader.downloader import DownloadStatus, SunoDownloader
 from tqdm import tqdm
 
 
+def iter_suno_urls(
+    jsonl_path: Union[str, Path], url_field: str = "url", id_field: str = "id"
+) -> Iterator[Tuple[str, str]]:
+    """
+    Lazily yield (url, id) pairs for the Suno records of a JSONL file.
+
+    Args:
+        jsonl_path: Path to JSONL file
+        url_field: Field name containing the URL
+        id_field: Field name containing the ID
+
+    Yields:
+        Tuples of URL and ID for records linking to Suno
+    """
+    with open(jsonl_path, "rb") as f:
+        for line in f:
+            # Most records are not Suno links, skip them before decoding
+            if b"suno.com" not in line:
+                continue
+            record = orjson.loads(line)
+            url = record.get(url_field) or ""
+            if "suno.com" in url:
+                yield url, record.get(id_field) or ""
+
+
 def parse_and_download_jsonl(
     downloader: SunoDownloader,
     jsonl_path: Union[str, Path],
     url_field: str = "url",
     id_field: str = "id",
     max_items: Optional[int] = None,
-    sleep_time: float = 0.5,
 ) -> Dict[str, Any]:
     """
     Download songs from a JSONL file containing URLs.
@@ -28,60 +52,51 @@ def parse_and_download_jsonl(
         url_field: Field name containing the URL
         id_field: Field name containing the ID
         max_items: Maximum number of items to download
-        sleep_time: Time to sleep between requests
 
     Returns:
         Dictionary with download statistics
     """
-    # Load the JSONL file
-    df = pd.read_json(jsonl_path, lines=True)
+    # Stream the Suno URLs instead of loading the whole file
+    rows = iter_suno_urls(jsonl_path, url_field, id_field)
 
     # Create results dictionary
     results = {"success": 0, "failed": 0, "skipped": 0, "urls": []}
 
-    # Filter to only Suno URLs
-    suno_df = df[df[url_field].str.contains("suno.com", na=False)]
-    print(f"Found {len(suno_df)} Suno URLs in JSONL file")
-
     # Limit number of items if specified
     if max_items and max_items > 0:
-        suno_df = suno_df.head(max_items)
+        rows = islice(rows, max_items)
         print(f"Processing first {max_items} Suno URLs")
 
     # Process each URL
-    for idx, row in tqdm(
-        suno_df.iterrows(), total=len(suno_df), desc="Downloading songs"
-    ):
-        url = row.get(url_field, "")
-        post_id = row.get(id_field, "")
-
+    for url, post_id in tqdm(rows, desc="Downloading songs"):
         if not url:
             print("Empty URL, skipping")
             results["skipped"] += 1
             continue
 
+        # Skip songs already on disk without issuing a request
+        if downloader.is_downloaded(url, post_id):
+            results["skipped"] += 1
+            results["urls"].append(
+                {"url": url, "id": post_id, "status": "skipped", "filepath": None}
+            )
+            continue
+
         print(f"Processing URL: {url}")
-        filepath = downloader.download_song(url, post_id)
-
-        url_result = {"url": url, "id": post_id, "status": "unknown", "filepath": None}
-
-        if filepath:
-            if "skipping download" in str(filepath):
-                url_result["status"] = "skipped"
-                results["skipped"] += 1
-            else:
-                url_result["status"] = "success"
-                url_result["filepath"] = str(filepath)
-                results["success"] += 1
-        else:
-            url_result["status"] = "failed"
-            results["failed"] += 1
+        status, filepath = downloader.download_song(url, post_id)
+
+        url_result = {
+            "url": url,
+            "id": post_id,
+            "status": status.value,
+            "filepath": None,
+        }
+        if status is DownloadStatus.SUCCESS:
+            url_result["filepath"] = str(filepath)
+        results[status.value] += 1
 
         results["urls"].append(url_result)
 
-        # Sleep to avoid rate limiting
-        time.sleep(sleep_time)
-
     return results
 
 
@@ -2,9 +2,11 @@
 Results reporting for the Suno Downloader.
 """
 
-import json
+import os
 from typing import Any, Dict
 
+import orjson
+
 
 def print_download_summary(results: Dict[str, Any]) -> None:
     """
@@ -36,10 +38,15 @@ def save_report(results: Dict[str, Any], report_path: str) -> None:
     """
     Save download results to a JSON file.
 
+    The report is written to a temporary file first and then renamed, so an
+    interrupted run never leaves a truncated report behind.
+
     Args:
         results: Dictionary with download statistics
         report_path: Path to save the report
     """
-    with open(report_path, "w") as f:
-        json.dump(results, f, indent=2)
+    tmp_path = f"{report_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, report_path)
     print(f"\nDownload report saved to: {report_path}")
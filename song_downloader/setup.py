@@ -6,9 +6,13 @@ setup(
     packages=find_packages(),
     install_requires=[
         "requests>=2.25.0",
-        "pandas>=1.2.0",
+        "orjson>=3.6.0",
         "tqdm>=4.60.0",
     ],
+    extras_require={
+        # Only needed by the standalone suno_song_downloader.py script
+        "reddit": ["pandas>=1.5.0"],
+    },
     entry_points={
         "console_scripts": [
             "suno-downloader=suno_downloader.main:main",
@@ -7,14 +7,29 @@ It tries yt-dlp first for compatibility with many sites, then falls back to dire
 """
 
 import argparse
-import json
+import http.client
+import logging
+import multiprocessing
 import os
 import re
+import shutil
+import threading
 import time
+from collections import defaultdict
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from enum import Enum
+from multiprocessing.util import Finalize
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-from urllib.parse import parse_qs, urlparse
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qs, urljoin, urlparse
 
+import numpy as np
+import orjson
 import pandas as pd
 import requests
 import yt_dlp as youtube_dl
@@ -22,10 +37,135 @@ from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 from urllib3.util import Retry
 
+logger = logging.getLogger(__name__)
+
+# Size of the buffer used to copy responses to disk
+DOWNLOAD_CHUNK = 1 << 20
+
+# Host serving the Suno audio files, reached over persistent connections
+SUNO_CDN_HOST = "cdn1.suno.ai"
+SUNO_CDN_TIMEOUT = 30
+SUNO_CDN_RETRIES = 5
+SUNO_CDN_BACKOFF = 0.1
+SUNO_CDN_MAX_REDIRECTS = 5
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+_RETRY_CODES = {429, 500, 502, 503, 504}
+
+_SANITIZE_RE = re.compile(r'[\\/*?:"<>|]')
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+_UUID_FULL_RE = re.compile(r"^" + _UUID_RE.pattern + r"$")
+
+# Fields of the Reddit posts used by the downloader, the rest is dropped on load
+_KEEP_COLS = (
+    "id",
+    "title",
+    "url",
+    "domain",
+    "permalink",
+    "link_flair_text",
+    "is_video",
+    "secure_media",
+)
+
+# Domains downloaded directly instead of through yt-dlp
+SUNO_DOMAINS = {"suno.com", "cdn1.suno.ai"}
+DIRECT_DOMAINS = {"v.redd.it"} | SUNO_DOMAINS
+
+# Unified domains that only serve pages, never worth a direct download after
+# yt-dlp fails. Other hosts are tried and kept only if they return media
+_NO_DIRECT = {
+    "youtube.com",
+    "soundcloud.com",
+    "twitter.com",
+    "open.spotify.com",
+    "spotify.com",
+    "reddit.com",
+    "instagram.com",
+    "tiktok.com",
+    "facebook.com",
+}
+
+# Aliases mapped to their unified domain, anything else is kept as is
+_DOMAIN_MAP = {
+    # unify youtube
+    "youtube.com": "youtube.com",
+    "youtu.be": "youtube.com",
+    "m.youtube.com": "youtube.com",
+    "music.youtube.com": "youtube.com",
+    # unify soundcloud
+    "soundcloud.com": "soundcloud.com",
+    "m.soundcloud.com": "soundcloud.com",
+    "on.soundcloud.com": "soundcloud.com",
+    # unify X/Twitter
+    "x.com": "twitter.com",
+}
+
+
+# yt-dlp instance of each thread, reused so extractors are only set up once
+_ydl_local = threading.local()
+
+
+def _get_ydl(opts: Dict[str, Any]) -> youtube_dl.YoutubeDL:
+    """
+    Return the yt-dlp instance of the current thread, creating it on first use.
+
+    Args:
+        opts: Base yt-dlp options, only used to create the instance
+
+    Returns:
+        yt-dlp instance shared by the downloads of this thread
+    """
+    ydl = getattr(_ydl_local, "ydl", None)
+    if ydl is None:
+        ydl = _ydl_local.ydl = youtube_dl.YoutubeDL(dict(opts))
+        # atexit handlers do not run in pool workers, multiprocessing finalizers do
+        Finalize(None, ydl.close, exitpriority=0)
+    return ydl
+
+
+def _ytdlp_download_one(
+    url: str, out_template: str, opts: Dict[str, Any]
+) -> Optional[str]:
+    """
+    Download a URL with yt-dlp, at module level so it can run in a worker process.
+
+    One yt-dlp instance is reused per worker thread or process.
+
+    Args:
+        url: URL to download from
+        out_template: Output path without extension, yt-dlp adds the extension
+        opts: Base yt-dlp options
+
+    Returns:
+        Path of the downloaded file or None if no file was created
+    """
+    # Point the shared instance at this post's filename
+    ydl = _get_ydl(opts)
+    ydl.params["outtmpl"]["default"] = out_template
+    ydl.download([url])
+
+    out_path = Path(out_template)
+    for downloaded_file in out_path.parent.glob(f"{out_path.name}.*"):
+        return str(downloaded_file)
+    return None
+
+
+class DownloadStatus(Enum):
+    """
+    Outcome of a single download.
+    """
+
+    SUCCESS = "success"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
 
 class SunoDownloader:
     def __init__(
-        self, output_dir: Union[str, Path] = "dataset", skip_existing: bool = True
+        self,
+        output_dir: Union[str, Path] = "dataset",
+        skip_existing: bool = True,
+        min_interval: float = 0.0,
     ):
         """
         Initialize the downloader with an output directory.
@@ -33,11 +173,19 @@ class SunoDownloader:
         Args:
             output_dir: Directory to save downloads
             skip_existing: If True, skip downloads that already exist
+            min_interval: Minimum time between downloads from hosts without
+                a specific interval
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.skip_existing = skip_existing
 
+        # Pace downloads per host so a throttled host does not slow the others
+        self.min_interval = min_interval
+        self._min_interval = {SUNO_CDN_HOST: 0.5, "v.redd.it": 0.2}
+        self._last_hit: Dict[str, float] = defaultdict(float)
+        self._gate_lock = threading.Lock()
+
         # Create subdirectories for different sources
         self.dirs: Dict[str, Path] = {
             "reddit": self.output_dir / "reddit",
@@ -48,19 +196,33 @@ class SunoDownloader:
         for directory in self.dirs.values():
             directory.mkdir(exist_ok=True)
 
+        # Index existing files by stem once instead of globbing for every post
+        self._existing: Dict[str, Dict[str, Path]] = {
+            name: {p.stem: p for p in directory.iterdir() if p.is_file()}
+            for name, directory in self.dirs.items()
+        }
+
         # Set up a requests session with retries
         self.session = requests.Session()
         retries = Retry(
             total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504]
         )
-        self.session.mount("http://", HTTPAdapter(max_retries=retries))
-        self.session.mount("https://", HTTPAdapter(max_retries=retries))
+        # Keep a large pool so consecutive CDN downloads reuse warm connections
+        adapter = HTTPAdapter(
+            pool_connections=32, pool_maxsize=64, pool_block=False, max_retries=retries
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.session.headers.update(
             {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+                "Connection": "keep-alive",
             }
         )
 
+        # One persistent connection to the Suno CDN per worker thread
+        self._suno_local = threading.local()
+
         # Base youtube-dl options
         self.ydl_opts = {
             "format": "bestaudio/best",
@@ -77,14 +239,25 @@ class SunoDownloader:
             "ignoreerrors": True,
             "no_color": True,
             "geo_bypass": True,
-            "retries": 10,
-            "fragment_retries": 10,
+            "retries": 5,
+            "fragment_retries": 5,
         }
 
+    def _gate(self, host: str) -> None:
+        """Wait until the minimum interval since the last request to a host passed."""
+        interval = self._min_interval.get(host, self.min_interval)
+        with self._gate_lock:
+            now = time.monotonic()
+            # Reserve the next slot so concurrent workers queue up behind it
+            slot = max(now, self._last_hit[host] + interval)
+            self._last_hit[host] = slot
+        if slot > now:
+            time.sleep(slot - now)
+
     def sanitize_filename(self, filename: str) -> str:
         """Sanitize a filename to remove invalid characters."""
         # Replace invalid characters with underscores
-        return re.sub(r'[\\/*?:"<>|]', "_", filename)
+        return _SANITIZE_RE.sub("_", filename)
 
     def check_existing_file(self, filepath: Path) -> Optional[Path]:
         """
@@ -97,11 +270,38 @@ class SunoDownloader:
             Path if file exists and should be skipped, None otherwise
         """
         if filepath.exists() and self.skip_existing:
-            print(f"  Found existing file: {filepath}, skipping download")
+            logger.debug("  Found existing file: %s, skipping download", filepath)
             return filepath
         return None
 
-    def download_reddit_video(self, post_data: Dict[str, Any]) -> Optional[Path]:
+    def save_response(self, response: requests.Response, filepath: Path) -> None:
+        """Copy a streamed response body to a file without iterating in Python."""
+        response.raw.decode_content = True
+        with open(filepath, "wb", buffering=DOWNLOAD_CHUNK) as f:
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK)
+
+    def save_preallocated(self, response: requests.Response, filepath: Path) -> None:
+        """Save a streamed response, reserving its Content-Length on disk first."""
+        size = int(response.headers.get("Content-Length", 0))
+        if not size or not hasattr(os, "posix_fallocate"):
+            self.save_response(response, filepath)
+            return
+
+        response.raw.decode_content = True
+        fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        with os.fdopen(fd, "wb", buffering=DOWNLOAD_CHUNK) as f:
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError:
+                # Not supported by every filesystem, write the file as usual
+                pass
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK)
+            # Drop the reserved space left over if the body was shorter
+            f.truncate()
+
+    def download_reddit_video(
+        self, post_data: Dict[str, Any]
+    ) -> Tuple[DownloadStatus, Optional[Path]]:
         """Download a Reddit video using direct download."""
         post_id = post_data["id"]
         title = self.sanitize_filename(post_data.get("title", post_id))
@@ -111,7 +311,7 @@ class SunoDownloader:
         # Check if file already exists
         existing = self.check_existing_file(filepath)
         if existing:
-            return existing
+            return DownloadStatus.SKIPPED, existing
 
         try:
             # Direct download if we have video information
@@ -124,110 +324,220 @@ class SunoDownloader:
                     "fallback_url"
                 )
                 if not video_url:
-                    print(f"  No fallback URL found in post data")
-                    return None
+                    logger.warning("  No fallback URL found in post data")
+                    return DownloadStatus.FAILED, None
 
-                print(f"  Downloading directly: {video_url}")
+                logger.info("  Downloading directly: %s", video_url)
                 # For reddit videos, download directly
-                response = self.session.get(video_url, stream=True)
-                if response.status_code == 200:
-                    print(f"  Direct download successful, saving to: {filepath}")
-                    with open(filepath, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    return filepath
-                else:
-                    print(
-                        f"  Direct download failed with status code: {response.status_code}"
-                    )
+                self._gate("v.redd.it")
+                with self.session.get(video_url, stream=True) as response:
+                    if response.status_code == 200:
+                        logger.info(
+                            "  Direct download successful, saving to: %s", filepath
+                        )
+                        self.save_preallocated(response, filepath)
+                        return DownloadStatus.SUCCESS, filepath
+                    else:
+                        logger.warning(
+                            "  Direct download failed with status code: %s",
+                            response.status_code,
+                        )
             else:
-                print(f"  No video information found in post data")
+                logger.warning("  No video information found in post data")
 
         except Exception as e:
-            print(f"  Error downloading Reddit video: {e}")
+            logger.warning("  Error downloading Reddit video: %s", e)
 
-        return None
+        return DownloadStatus.FAILED, None
 
-    def download_suno_audio(self, url: str, post_id: str) -> Optional[Path]:
+    def download_suno_audio(self, url: str) -> Tuple[DownloadStatus, Optional[Path]]:
         """
         Download audio from Suno.ai using the simplified method.
 
         Args:
             url: Original Suno URL
-            post_id: Post ID for the filename
 
         Returns:
-            Path to the downloaded file or None if failed
+            Download status and the path to the file, None if failed
         """
-        # Create a filename based on the post ID
-        filename = f"{post_id}.mp3"
-        filepath = self.dirs["suno"] / filename
+        song_id = extract_song_id(url)
+        if not song_id:
+            logger.warning("  Could not extract Suno song ID from URL: %s", url)
+            return DownloadStatus.FAILED, None
+
+        # Name the file after the song so posts sharing a song share the file
+        filepath = self.dirs["suno"] / f"{song_id}.mp3"
 
         # Check if file already exists
         existing = self.check_existing_file(filepath)
         if existing:
-            return existing
+            return DownloadStatus.SKIPPED, existing
 
         try:
-            # Extract the song ID from the URL
-            # URL pattern: https://suno.com/song/{song_id}
-            parsed_url = urlparse(url)
-            path_parts = parsed_url.path.strip("/").split("/")
-
-            # If the URL format is as expected
-            if len(path_parts) >= 2 and path_parts[0] == "song":
-                song_id = path_parts[1]
-                # Construct the direct CDN URL
-                cdn_url = f"https://cdn1.suno.ai/{song_id}.mp3"
-
-                print(f"  Using direct CDN URL: {cdn_url}")
-
-                # Download the audio file
-                response = self.session.get(cdn_url, stream=True)
-                if response.status_code == 200:
-                    print(f"  Downloading audio to: {filepath}")
-                    with open(filepath, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    return filepath
-                else:
-                    print(f"  Failed to download audio: HTTP {response.status_code}")
-                    print(f"  URL attempted: {cdn_url}")
-            else:
-                # If we can't extract the song ID from the URL, try to get it from the URL itself
-                match = re.search(
-                    r"([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})",
-                    url,
-                )
-                if match:
-                    song_id = match.group(1)
-                    cdn_url = f"https://cdn1.suno.ai/{song_id}.mp3"
+            if self.download_cdn_audio(song_id, filepath):
+                return DownloadStatus.SUCCESS, filepath
+        except Exception as e:
+            logger.warning("  Error downloading Suno audio %s: %s", url, e)
+
+        return DownloadStatus.FAILED, None
+
+    def _suno_connection(self, host: str) -> http.client.HTTPSConnection:
+        """Get this thread's persistent connection to a Suno CDN host."""
+        conns = getattr(self._suno_local, "conns", None)
+        if conns is None:
+            conns = self._suno_local.conns = {}
+        conn = conns.get(host)
+        if conn is None:
+            conn = conns[host] = http.client.HTTPSConnection(
+                host, timeout=SUNO_CDN_TIMEOUT
+            )
+        return conn
+
+    def suno_request(
+        self, method: str, path: str, headers: Optional[Dict[str, str]] = None
+    ) -> http.client.HTTPResponse:
+        """
+        Send a request to the Suno CDN over this thread's persistent connection.
 
-                    print(f"  Using direct CDN URL (from regex): {cdn_url}")
+        Redirects are followed and throttled or failing requests are retried, as
+        the requests session does for other hosts. The response must be read
+        completely before the next request is sent.
 
-                    # Download the audio file
-                    response = self.session.get(cdn_url, stream=True)
-                    if response.status_code == 200:
-                        print(f"  Downloading audio to: {filepath}")
-                        with open(filepath, "wb") as f:
-                            for chunk in response.iter_content(chunk_size=8192):
-                                f.write(chunk)
-                        return filepath
-                    else:
-                        print(
-                            f"  Failed to download audio: HTTP {response.status_code}"
-                        )
-                        print(f"  URL attempted: {cdn_url}")
+        Args:
+            method: HTTP method
+            path: Path of the file on the CDN
+            headers: Additional request headers
+
+        Returns:
+            Response of the CDN
+        """
+        headers = {"User-Agent": self.session.headers["User-Agent"], **(headers or {})}
+        host = SUNO_CDN_HOST
+        redirects = retries = 0
+        while True:
+            conn = self._suno_connection(host)
+            try:
+                conn.request(method, path, headers=headers)
+                response = conn.getresponse()
+            except (ConnectionError, http.client.HTTPException):
+                # The CDN closes idle connections, reconnect once and retry
+                conn.close()
+                conn.request(method, path, headers=headers)
+                response = conn.getresponse()
+
+            location = response.getheader("Location")
+            if (
+                response.status in _REDIRECT_CODES
+                and location
+                and redirects < SUNO_CDN_MAX_REDIRECTS
+            ):
+                response.read()
+                redirects += 1
+                target = urlparse(urljoin(f"https://{host}{path}", location))
+                host = target.netloc
+                path = f"{target.path}?{target.query}" if target.query else target.path
+                continue
+
+            if response.status in _RETRY_CODES and retries < SUNO_CDN_RETRIES:
+                response.read()
+                retry_after = response.getheader("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = float(retry_after)
                 else:
-                    print(f"  Could not extract Suno song ID from URL: {url}")
-        except Exception as e:
-            print(f"  Error downloading Suno audio {url}: {e}")
+                    delay = SUNO_CDN_BACKOFF * 2**retries
+                retries += 1
+                time.sleep(delay)
+                continue
+
+            return response
+
+    def _log_cdn_failure(self, response: http.client.HTTPResponse, path: str) -> None:
+        """Log why a Suno CDN request did not return the audio file."""
+        if response.status in _REDIRECT_CODES:
+            reason = "too many redirects"
+        elif response.status in _RETRY_CODES:
+            reason = f"still failing after {SUNO_CDN_RETRIES} retries"
+        else:
+            reason = "not available"
+        logger.warning(
+            "  Failed to download audio: HTTP %s, %s (%s%s)",
+            response.status,
+            reason,
+            SUNO_CDN_HOST,
+            path,
+        )
 
-        return None
+    def download_cdn_audio(self, song_id: str, filepath: Path) -> Optional[Path]:
+        """
+        Download a Suno CDN file, resuming a previous partial download if possible.
+
+        Args:
+            song_id: Suno song ID
+            filepath: Path to save the audio to
+
+        Returns:
+            Path to the downloaded file or None if failed
+        """
+        path = f"/{song_id}.mp3"
+
+        # Check the file is available before transferring any body
+        self._gate(SUNO_CDN_HOST)
+        head = self.suno_request("HEAD", path)
+        head.read()
+        if head.status != 200:
+            self._log_cdn_failure(head, path)
+            return None
+
+        # Data is written to a .part file that is renamed once complete
+        size = int(head.getheader("Content-Length", 0))
+        part_path = filepath.with_name(filepath.name + ".part")
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        if size and offset == size:
+            part_path.replace(filepath)
+            return filepath
+
+        headers = {"Range": f"bytes={offset}-"} if 0 < offset < size else {}
+
+        # Download the audio file, reading the whole body to keep the connection.
+        # The GET is paced like the HEAD so every CDN request respects the interval
+        self._gate(SUNO_CDN_HOST)
+        response = self.suno_request("GET", path, headers)
+        if response.status not in (200, 206):
+            response.read()
+            self._log_cdn_failure(response, path)
+            return None
+
+        # Append only if the server honored the range request
+        resumed = response.status == 206
+        length = int(response.getheader("Content-Length", 0))
+        expected = (offset if resumed else 0) + length if length else size
+        mode = "ab" if resumed else "wb"
+        logger.info("  Downloading audio to: %s", filepath)
+        with open(part_path, mode, buffering=DOWNLOAD_CHUNK) as f:
+            shutil.copyfileobj(response, f, length=DOWNLOAD_CHUNK)
+
+        # A dropped connection ends the body early without raising, keep the
+        # .part file so the next run resumes it instead of accepting it
+        written = part_path.stat().st_size
+        if expected and written != expected:
+            logger.warning(
+                "  Incomplete download of %s: %s of %s bytes",
+                filepath,
+                written,
+                expected,
+            )
+            return None
+
+        part_path.replace(filepath)
+        return filepath
 
     def download_generic_url(
-        self, url: str, post_id: str, domain: str
-    ) -> Optional[Path]:
+        self,
+        url: str,
+        post_id: str,
+        domain: str,
+        ytdlp_pool: Optional[Executor] = None,
+    ) -> Tuple[DownloadStatus, Optional[Path]]:
         """
         Download from a generic URL using yt-dlp first, then falling back to direct download.
 
@@ -235,12 +545,15 @@ class SunoDownloader:
             url: URL to download from
             post_id: Post ID for the filename
             domain: Domain for categorization
+            ytdlp_pool: Optional executor running yt-dlp, used instead of this process
 
         Returns:
-            Path to the downloaded file or None if failed
+            Download status and the path to the file, None if failed
         """
         # Determine the output directory and filename
-        domain_dir = self.dirs.get(domain, self.dirs["others"])
+        domain_name = domain if domain in self.dirs else "others"
+        domain_dir = self.dirs[domain_name]
+        existing_stems = self._existing[domain_name]
 
         # Create a base filename without extension (yt-dlp will add the appropriate extension)
         base_filename = f"{self.sanitize_filename(post_id)}"
@@ -260,105 +573,179 @@ class SunoDownloader:
 
         # Check if either file already exists
         # We need to check both possible filenames
-        existing_files = list(domain_dir.glob(f"{base_filename}.*"))
-        if existing_files and self.skip_existing:
-            existing_file = existing_files[0]
-            print(f"  Found existing file: {existing_file}, skipping download")
-            return existing_file
+        existing_file = existing_stems.get(base_filename)
+        if existing_file and self.skip_existing:
+            logger.debug("  Found existing file: %s, skipping download", existing_file)
+            return DownloadStatus.SKIPPED, existing_file
 
         existing = self.check_existing_file(filepath_direct)
         if existing:
-            return existing
+            return DownloadStatus.SKIPPED, existing
+
+        self._gate(domain)
 
         # First attempt: Try yt-dlp as it supports many sites
-        print(f"  Trying yt-dlp for {url}...")
+        logger.debug("  Trying yt-dlp for %s...", url)
         try:
-            # Configure yt-dlp options
-            ydl_opts = {
-                "format": "bestaudio/best",
-                "postprocessors": [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": "mp3",
-                        "preferredquality": "192",
-                    }
-                ],
-                "outtmpl": str(filepath_base),
-                "quiet": True,
-                "no_warnings": True,
-                "nocheckcertificate": True,
-                "ignoreerrors": True,
-                "no_color": True,
-                "geo_bypass": True,
-                "retries": 5,
-                "fragment_retries": 5,
-            }
-
-            with youtube_dl.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-
-                # Check if any file was created with the base filename
-                new_existing_files = list(domain_dir.glob(f"{base_filename}.*"))
-                if new_existing_files:
-                    downloaded_file = new_existing_files[0]
-                    print(f"  yt-dlp successfully downloaded: {downloaded_file}")
-                    return downloaded_file
-
-                print(
-                    f"  yt-dlp did not create any files, falling back to direct download"
-                )
+            args = (url, str(filepath_base), self.ydl_opts)
+            if ytdlp_pool is None:
+                downloaded = _ytdlp_download_one(*args)
+            else:
+                downloaded = ytdlp_pool.submit(_ytdlp_download_one, *args).result()
+
+            # Check if any file was created with the base filename
+            if downloaded:
+                downloaded_file = Path(downloaded)
+                existing_stems[base_filename] = downloaded_file
+                logger.info("  yt-dlp successfully downloaded: %s", downloaded_file)
+                return DownloadStatus.SUCCESS, downloaded_file
+
+            logger.info(
+                "  yt-dlp did not create any files, falling back to direct download"
+            )
         except Exception as e:
-            print(f"  yt-dlp download failed: {e}")
-            print(f"  Falling back to direct download")
+            logger.info(
+                "  yt-dlp download failed: %s, falling back to direct download", e
+            )
 
         # Second attempt: Try direct download if yt-dlp failed
+        if domain in _NO_DIRECT:
+            logger.info("  No direct download fallback for %s", domain)
+            return DownloadStatus.FAILED, None
+
         try:
-            print(f"  Attempting direct download from {url}")
-            response = self.session.get(url, stream=True)
-            if response.status_code == 200:
-                print(f"  Direct download successful, saving to: {filepath_direct}")
-                with open(filepath_direct, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                return filepath_direct
-            else:
-                print(
-                    f"  Direct download failed with status code: {response.status_code}"
-                )
+            logger.debug("  Attempting direct download from %s", url)
+            with self.session.get(url, stream=True) as response:
+                content_type = response.headers.get("Content-Type", "")
+                if response.status_code == 200 and not content_type.startswith(
+                    ("audio/", "video/")
+                ):
+                    logger.warning(
+                        "  Direct download is not media (%s), not saving it",
+                        content_type or "unknown type",
+                    )
+                elif response.status_code == 200:
+                    logger.info(
+                        "  Direct download successful, saving to: %s", filepath_direct
+                    )
+                    self.save_response(response, filepath_direct)
+                    existing_stems[filepath_direct.stem] = filepath_direct
+                    return DownloadStatus.SUCCESS, filepath_direct
+                else:
+                    logger.warning(
+                        "  Direct download failed with status code: %s",
+                        response.status_code,
+                    )
         except Exception as e:
-            print(f"  Error during direct download: {e}")
+            logger.warning("  Error during direct download: %s", e)
 
         # If we get here, both methods failed
-        return None
+        return DownloadStatus.FAILED, None
 
 
-def unify_domain(domain: str) -> str:
+def extract_song_id(url: str) -> Optional[str]:
     """
-    Unify domain names for better categorization.
+    Extract a Suno song ID from a URL.
 
     Args:
-        domain: The domain to unify
+        url: The URL to extract from
 
     Returns:
-        Unified domain name
+        Song ID if found, None otherwise
     """
-    if not domain:
-        return "N/A"
-    d = domain.lower().strip()
-    # unify youtube
-    if d in ["youtube.com", "youtu.be", "m.youtube.com", "music.youtube.com"]:
-        return "youtube.com"
-    # unify soundcloud
-    if d in ["soundcloud.com", "m.soundcloud.com", "on.soundcloud.com"]:
-        return "soundcloud.com"
-    # unify X/Twitter
-    if d == "x.com":
-        return "twitter.com"
-    # handle empty domains
-    if not d:
-        return "N/A"
-    # for everything else, just return as is
-    return d
+    # URL pattern: https://suno.com/song/{song_id}, sliced without splitting
+    start = url.find("/song/")
+    if start != -1:
+        candidate = url[start + 6 : start + 42]
+        if _UUID_FULL_RE.match(candidate):
+            return candidate
+
+    # If that fails, try to extract UUID pattern from anywhere in the URL
+    match = _UUID_RE.search(url)
+    return match.group(0) if match else None
+
+
+def unify_domains(domains: pd.Series) -> pd.Series:
+    """
+    Unify a column of domain names using vectorized pandas operations.
+
+    Args:
+        domains: Series of domains to unify
+
+    Returns:
+        Series of unified domain names
+    """
+    d = domains.fillna("").str.lower().str.strip()
+    return d.map(_DOMAIN_MAP).fillna(d).replace("", "N/A")
+
+
+def download_post(
+    downloader: SunoDownloader,
+    row: Dict[str, Any],
+    ytdlp_pool: Optional[Executor] = None,
+) -> Tuple[Optional[Path], str]:
+    """
+    Download the media of a single Reddit post.
+
+    Args:
+        downloader: Initialized SunoDownloader instance
+        row: Post data with its unified domain
+        ytdlp_pool: Optional executor running yt-dlp for generic downloads
+
+    Returns:
+        Path to the downloaded file (None if failed) and a status message
+    """
+    post_id = row["id"]
+    title = row.get("title", "No title")
+    url = row.get("url", "No URL")
+    domain = row.get("domain_unified", "Unknown domain")
+    permalink = row.get("permalink", None)
+
+    # Construct Reddit URL if permalink exists
+    reddit_url = f"https://reddit.com{permalink}" if permalink else "No Reddit URL"
+
+    # Log the header at once so it is not interleaved with other workers
+    logger.debug(
+        "Processing [%s] - Domain: %s\n  Title: %s\n  URL: %s\n  Reddit URL: %s",
+        post_id,
+        domain,
+        title,
+        url,
+        reddit_url,
+    )
+
+    # Check if the URL is valid
+    if not url or url == "No URL":
+        status = "Skipped: No valid URL found"
+        logger.warning("  [%s] Status: %s", post_id, status)
+        return None, status
+
+    # Determine appropriate downloader based on domain
+    if domain == "v.redd.it":
+        logger.debug("  [%s] Using: Reddit video downloader", post_id)
+        result, download_path = downloader.download_reddit_video(row)
+    elif domain in SUNO_DOMAINS:
+        logger.debug("  [%s] Using: Suno audio downloader", post_id)
+        result, download_path = downloader.download_suno_audio(url)
+    else:
+        # For all other domains, use the generic downloader which tries yt-dlp first
+        logger.debug("  [%s] Using: Generic downloader for %s", post_id, domain)
+        result, download_path = downloader.download_generic_url(
+            url, post_id, domain, ytdlp_pool
+        )
+
+    # Record the download path and status
+    if result is DownloadStatus.SKIPPED:
+        status = "Skipped: File already exists"
+        logger.info("  [%s] Status: %s", post_id, status)
+    elif result is DownloadStatus.SUCCESS:
+        status = f"Downloaded to: {download_path}"
+        logger.info("  [%s] Status: %s", post_id, status)
+    else:
+        status = "Failed: Download was not successful"
+        logger.warning("  [%s] Status: %s", post_id, status)
+
+    return download_path, status
 
 
 def download_songs_from_dataframe(
@@ -367,6 +754,7 @@ def download_songs_from_dataframe(
     max_items: Optional[int] = None,
     skip_existing: bool = True,
     sleep_time: float = 0.5,
+    max_workers: int = 4,
 ) -> pd.DataFrame:
     """
     Process a dataframe of Suno AI posts and download all songs.
@@ -376,17 +764,16 @@ def download_songs_from_dataframe(
         output_dir: Directory to save downloads
         max_items: Maximum number of items to download (for testing)
         skip_existing: If True, skip downloads that already exist
-        sleep_time: Time to sleep between downloads to avoid rate limiting
+        sleep_time: Minimum time between downloads from the same host, for hosts
+            without a specific interval
+        max_workers: Number of posts downloaded concurrently
 
     Returns:
         Updated DataFrame with download paths
     """
-    downloader = SunoDownloader(output_dir=output_dir, skip_existing=skip_existing)
-
-    # Create a new column for download paths
-    df["download_path"] = None
-    # Create a column for download status
-    df["download_status"] = None
+    downloader = SunoDownloader(
+        output_dir=output_dir, skip_existing=skip_existing, min_interval=sleep_time
+    )
 
     # Filter to keep only rows that might have audio
     audio_domains = [
@@ -396,63 +783,79 @@ def download_songs_from_dataframe(
         "cdn1.suno.ai",
         "soundcloud.com",
     ]
-    potential_audio = df[df["domain_unified"].isin(audio_domains) | df["is_video"]]
-
-    # Limit number of items if specified
-    if max_items and max_items > 0:
-        potential_audio = potential_audio.head(max_items)
-
-    # Download each post
-    for idx, row in tqdm(potential_audio.iterrows(), total=len(potential_audio)):
-        post_id = row["id"]
-        title = row.get("title", "No title")
-        url = row.get("url", "No URL")
-        domain = row.get("domain_unified", "Unknown domain")
-        permalink = row.get("permalink", None)
-
-        # Construct Reddit URL if permalink exists
-        reddit_url = f"https://reddit.com{permalink}" if permalink else "No Reddit URL"
-
-        print(f"Processing [{post_id}] - Domain: {domain}")
-        print(f"  Title: {title}")
-        print(f"  URL: {url}")
-        print(f"  Reddit URL: {reddit_url}")
-
-        # Check if the URL is valid
-        if not url or url == "No URL":
-            status = "Skipped: No valid URL found"
-            print(f"  Status: {status}")
-            df.at[idx, "download_status"] = status
-            continue
-
-        # Determine appropriate downloader based on domain
-        if domain == "v.redd.it":
-            print(f"  Using: Reddit video downloader")
-            download_path = downloader.download_reddit_video(row)
-        elif domain in ["suno.com", "cdn1.suno.ai"]:
-            print(f"  Using: Suno audio downloader")
-            download_path = downloader.download_suno_audio(url, post_id)
-        else:
-            # For all other domains, use the generic downloader which tries yt-dlp first
-            print(f"  Using: Generic downloader for {domain}")
-            download_path = downloader.download_generic_url(url, post_id, domain)
-
-        # Record the download path and status
-        if download_path:
-            if skip_existing and "skipping download" in str(download_path):
-                status = "Skipped: File already exists"
-            else:
-                status = f"Downloaded to: {download_path}"
-            df.at[idx, "download_path"] = str(download_path)
+    mask = np.isin(df["domain_unified"].to_numpy(), audio_domains) | df[
+        "is_video"
+    ].fillna(False).to_numpy(dtype=bool)
+
+    # Limit number of items if specified and select the rows at once
+    limit = max_items if max_items and max_items > 0 else None
+    potential_audio = df.iloc[np.flatnonzero(mask)[:limit]]
+
+    # Crossposts share URLs, so download each URL once with its first post and
+    # remember the other posts pointing at it, iterating over plain dicts.
+    # Suno files are named after the song, so different URLs of the same song
+    # share a key to never write the same file from two workers
+    rows = []
+    posts_by_key: Dict[str, List[Any]] = {}
+    shared_posts: Dict[Any, List[Any]] = {}
+    for idx, row in zip(potential_audio.index, potential_audio.to_dict("records")):
+        url = row.get("url")
+        key = url if isinstance(url, str) else None
+        if key and row["domain_unified"] in SUNO_DOMAINS:
+            key = extract_song_id(key) or key
+        if not key:
+            rows.append((idx, row))
+            shared_posts[idx] = [idx]
+        elif key in posts_by_key:
+            posts_by_key[key].append(idx)
         else:
-            status = "Failed: Download was not successful"
+            rows.append((idx, row))
+            shared_posts[idx] = posts_by_key[key] = [idx]
+
+    # Buffer the results and write them to the dataframe once at the end
+    paths: Dict[Any, str] = {}
+    statuses: Dict[Any, str] = {}
+
+    def record(idx: Any, download_path: Optional[Path], status: str) -> None:
+        for post_idx in shared_posts[idx]:
+            if download_path:
+                paths[post_idx] = str(download_path)
+            statuses[post_idx] = status
+
+    # Split posts between direct downloads and the ones handled by yt-dlp
+    direct_rows = [
+        (idx, row) for idx, row in rows if row["domain_unified"] in DIRECT_DOMAINS
+    ]
+    generic_rows = [
+        (idx, row) for idx, row in rows if row["domain_unified"] not in DIRECT_DOMAINS
+    ]
 
-        df.at[idx, "download_status"] = status
-        print(f"  Status: {status}")
-        print("-" * 80)
+    # Download direct posts concurrently
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(download_post, downloader, row): idx for idx, row in direct_rows
+        }
+        for future in tqdm(as_completed(futures), total=len(futures)):
+            record(futures[future], *future.result())
+
+    # yt-dlp spends most of its time encoding with ffmpeg, so it runs in worker
+    # processes while threads wait on them and handle the direct fallbacks.
+    # Workers are spawned, forking while other threads hold locks can deadlock them
+    ytdlp_workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=ytdlp_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as ytdlp_pool:
+        with ThreadPoolExecutor(max_workers=ytdlp_workers) as pool:
+            futures = {
+                pool.submit(download_post, downloader, row, ytdlp_pool): idx
+                for idx, row in generic_rows
+            }
+            for future in tqdm(as_completed(futures), total=len(futures)):
+                record(futures[future], *future.result())
 
-        # Sleep to avoid rate limiting
-        time.sleep(sleep_time)
+    # Create the download path and status columns
+    df["download_path"] = pd.Series(paths, index=df.index, dtype=object)
+    df["download_status"] = pd.Series(statuses, index=df.index, dtype=object)
 
     # Print summary of downloads
     success = df["download_path"].notna().sum()
@@ -473,8 +876,33 @@ def download_songs_from_dataframe(
     return df
 
 
+def iter_posts(jsonl_path: Union[str, Path], flairs: Set[str]) -> Iterator[dict]:
+    """
+    Stream the posts of a JSONL file that have one of the given flairs.
+
+    Args:
+        jsonl_path: Path to JSONL file with Reddit posts
+        flairs: Flairs to keep
+
+    Yields:
+        Posts projected to the fields used by the downloader
+    """
+    with open(jsonl_path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            post = orjson.loads(line)
+            if post.get("link_flair_text") in flairs:
+                yield {key: post.get(key) for key in _KEEP_COLS}
+
+
 def main():
     """Main function."""
+    # Let pandas share data between frames instead of copying defensively,
+    # pandas 3 always does so and deprecates the option
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
     parser = argparse.ArgumentParser(
         description="Download songs from the SunoAI subreddit."
     )
@@ -506,34 +934,48 @@ def main():
         "--force", action="store_true", help="Force re-download of existing files"
     )
     parser.add_argument(
-        "--sleep", type=float, default=0.5, help="Sleep time between requests"
+        "--sleep",
+        type=float,
+        default=0.5,
+        help="Minimum time between requests to the same host",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Number of concurrent downloads"
     )
 
     # Output options
     parser.add_argument("--save", help="Save the updated dataframe to JSONL file")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Log the progress of every download"
+    )
 
     # Parse arguments
     args = parser.parse_args()
 
+    # Only warnings are logged by default to keep the download loop quiet
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(message)s",
+    )
+
     # Print banner
     print("\n==================================================")
     print("           SUNO REDDIT SONG DOWNLOADER            ")
     print("==================================================\n")
 
-    # Load the JSONL file
+    # Load the JSONL file, filtering by flairs while reading
     print(f"Loading data from {args.input}...")
     input_path = Path(args.input)
-    df = pd.read_json(input_path, lines=True)
-
-    # Filter by flairs
     flair_filter = args.flairs
     print(f"Filtering by flairs: {', '.join(flair_filter)}")
-    ai_songs = df[df["link_flair_text"].isin(flair_filter)]
+    ai_songs = pd.DataFrame(
+        iter_posts(input_path, set(flair_filter)), columns=list(_KEEP_COLS)
+    )
     print(f"Found {len(ai_songs)} posts with song flairs")
 
     # Unify domains
     print("Unifying domains...")
-    ai_songs["domain_unified"] = ai_songs["domain"].apply(unify_domain)
+    ai_songs = ai_songs.assign(domain_unified=lambda x: unify_domains(x["domain"]))
 
     # Display domain counts
     domain_counts = ai_songs["domain_unified"].value_counts()
@@ -547,11 +989,12 @@ def main():
 
     # Download with specified parameters
     result_df = download_songs_from_dataframe(
-        ai_songs.copy(),
+        ai_songs,
         output_dir=output_dir,
         max_items=args.max,
         skip_existing=not args.force,
         sleep_time=args.sleep,
+        max_workers=args.workers,
     )
 
     # Save the updated dataframe if requested
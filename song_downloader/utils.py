@@ -3,9 +3,39 @@ Utility functions for the Suno Downloader.
 """
 
 import re
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+_SANITIZE_RE = re.compile(r'[\\/*?:"<>|]')
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+_UUID_FULL_RE = re.compile(r"^" + _UUID_RE.pattern + r"$")
+
+
+def build_session() -> requests.Session:
+    """
+    Build a requests session with retries and a connection pool.
+
+    Returns:
+        Session that can be shared between downloaders
+    """
+    session = requests.Session()
+    retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(
+        {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
+    )
+    return session
+
 
 def sanitize_filename(filename: str) -> str:
     """
@@ -18,7 +48,7 @@ def sanitize_filename(filename: str) -> str:
         Sanitized filename
     """
     # Replace invalid characters with underscores
-    return re.sub(r'[\\/*?:"<>|]', "_", filename)
+    return _SANITIZE_RE.sub("_", filename)
 
 
 def check_existing_file(filepath: Path, skip_existing: bool) -> Optional[Path]:
@@ -48,26 +78,50 @@ def extract_song_id(url: str) -> Optional[str]:
     Returns:
         Song ID if found, None otherwise
     """
-    # Try to extract from URL path first
-    # URL pattern: https://suno.com/song/{song_id}
-    parts = url.strip("/").split("/")
-
-    for i, part in enumerate(parts):
-        if part == "song" and i + 1 < len(parts):
-            song_id = parts[i + 1]
-            # Validate that it looks like a UUID
-            if re.match(
-                r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
-                song_id,
-            ):
-                return song_id
+    # URL pattern: https://suno.com/song/{song_id}, sliced without splitting
+    start = url.find("/song/")
+    if start != -1:
+        candidate = url[start + 6 : start + 42]
+        if _UUID_FULL_RE.match(candidate):
+            return candidate
 
     # If that fails, try to extract UUID pattern from anywhere in the URL
-    match = re.search(
-        r"([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})",
-        url,
-    )
-    if match:
-        return match.group(1)
+    match = _UUID_RE.search(url)
+    return match.group(0) if match else None
 
-    return None
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the rate of requests while allowing bursts.
+    """
+
+    def __init__(self, rate: float = 2.0, capacity: int = 4):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Number of tokens added per second
+            capacity: Maximum number of tokens the bucket can hold
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until a token is available and take it.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)